@@ -0,0 +1,179 @@
+import re
+import threading
+from functools import lru_cache
+from typing import Any
+
+import ahocorasick  # type: ignore[import-not-found]
+import hyperscan
+
+# Pure string-processing helpers used by the request handlers in server.py.
+# Kept free of FastAPI/pydantic and fully annotated so it can be compiled
+# with `mypyc analyzer.py`; the plain module works the same uncompiled.
+
+
+# ---------------- PATTERNS ----------------
+# [ \t] rather than \s so an empty field can't run on into the next line
+HEADER_FIELDS_RE = re.compile(
+    rb"^(Subject|From|To|Date):[ \t]*([^\r\n]*)", re.IGNORECASE | re.MULTILINE
+)
+ANGLE_RE = re.compile(r"<(.+?)>")
+SUSPICIOUS_DOMAIN_RE = re.compile(r"\d{3,}|-|secure|login|verify", re.IGNORECASE)
+
+
+# ---------------- HELPER FUNCTION ----------------
+def extract_fields(raw: bytes) -> dict[str, str]:
+    fields: dict[str, str] = {}
+    for match in HEADER_FIELDS_RE.finditer(raw):
+        name = match.group(1).title().decode()
+        if name not in fields:
+            # only the matched values are decoded for the response
+            fields[name] = match.group(2).strip().decode("utf-8", errors="replace")
+    return fields
+
+
+# ---------------- DOMAIN REPUTATION ----------------
+TRUSTED_TLDS = (".gov", ".edu")
+COMMON_MAIL_PROVIDERS = frozenset({"gmail.com", "outlook.com", "yahoo.com", "icloud.com"})
+KNOWN_BRANDS = ["sbi", "paypal", "amazon", "google", "microsoft", "apple"]
+
+BRAND_AC = ahocorasick.Automaton()
+for b in KNOWN_BRANDS:
+    BRAND_AC.add_word(b, b)
+BRAND_AC.make_automaton()
+
+
+# the From line comes from an untrusted header of any size, so only lines
+# up to this length are cached; that bounds the cache at roughly
+# 4096 * 320 characters (~1-2MB) whatever the input
+MAX_CACHED_SENDER = 320
+
+
+def domain_reputation(sender_line: str) -> tuple[str, str]:
+    if len(sender_line) > MAX_CACHED_SENDER:
+        return _domain_reputation(sender_line)
+    return _cached_domain_reputation(sender_line)
+
+
+def _domain_reputation(sender_line: str) -> tuple[str, str]:
+    name_part = sender_line.lower()
+    match = ANGLE_RE.search(name_part)
+    if not match:
+        return "Unknown", "Could not extract sender domain"
+
+    domain = match.group(1).split("@")[-1]
+
+    if domain.endswith(TRUSTED_TLDS):
+        return "Trusted", "Official organization domain"
+
+    if domain in COMMON_MAIL_PROVIDERS:
+        return "Neutral", "Public email provider"
+
+    for _, brand in BRAND_AC.iter(name_part):
+        if brand not in domain:
+            return "Suspicious", f"Brand name '{brand}' does not match domain"
+
+    if SUSPICIOUS_DOMAIN_RE.search(domain):
+        return "Suspicious", "Domain looks auto-generated or phishing-style"
+
+    return "Unknown", "No strong indicators"
+
+
+# senders repeat heavily (newsletters, bulk phishing runs) and the verdict
+# depends only on the From line
+_cached_domain_reputation = lru_cache(maxsize=4096)(_domain_reputation)
+
+
+# ---------------- PHISHING SCORE ----------------
+KEYWORDS = [
+    "verify", "urgent", "suspend", "immediately", "click",
+    "login", "password", "bank", "account blocked",
+    "lottery", "winner", "reward", "free", "otp"
+]
+LINK_INDICATORS = ["http://", "bit.ly", "tinyurl"]
+AUTH_FAIL_INDICATORS = ["spf=fail", "dkim=fail"]
+INDICATORS = KEYWORDS + LINK_INDICATORS + AUTH_FAIL_INDICATORS
+
+KEYWORD_MESSAGES = {k: f"Suspicious word detected: {k}" for k in KEYWORDS}
+
+KEYWORD_SCORE = 12
+AUTH_FAIL_SCORE = 35
+LINK_SCORE = 20
+HIGH_RISK_SCORE = 70
+MEDIUM_RISK_SCORE = 35
+
+# caseless, so the raw bytes are scanned without a lower() copy
+INDICATOR_DB = hyperscan.Database()
+INDICATOR_DB.compile(
+    expressions=[i.encode() for i in INDICATORS],
+    flags=hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_CASELESS,
+    literal=True,
+)
+
+# scratch space can't be shared between concurrent scans
+_scan_local = threading.local()
+
+
+def indicator_score(found: set[str]) -> int:
+    score = KEYWORD_SCORE * len(found.intersection(KEYWORDS))
+    if not found.isdisjoint(AUTH_FAIL_INDICATORS):
+        score += AUTH_FAIL_SCORE
+    if not found.isdisjoint(LINK_INDICATORS):
+        score += LINK_SCORE
+    return score
+
+
+def _on_indicator(id_: int, start: int, end: int, flags: int, found: Any) -> bool:
+    found.add(INDICATORS[id_])
+    # once the score is already High, further hits only pad the reasons;
+    # returning True makes hyperscan stop the scan
+    return indicator_score(found) >= HIGH_RISK_SCORE
+
+
+def find_indicators(h: bytes) -> set[str]:
+    scratch = getattr(_scan_local, "scratch", None)
+    if scratch is None:
+        scratch = _scan_local.scratch = INDICATOR_DB.scratch.clone()
+
+    found: set[str] = set()
+    try:
+        INDICATOR_DB.scan(
+            h,
+            match_event_handler=_on_indicator,
+            context=found,
+            scratch=scratch,
+        )
+    except hyperscan.ScanTerminated:
+        pass
+    return found
+
+
+def detect_phishing(raw: bytes) -> tuple[str, list[str], int]:
+    score = 0
+    reasons: list[str] = []
+
+    found = find_indicators(raw)
+
+    for k in KEYWORDS:
+        if k in found:
+            score += KEYWORD_SCORE
+            reasons.append(KEYWORD_MESSAGES[k])
+
+    if not found.isdisjoint(AUTH_FAIL_INDICATORS):
+        score += AUTH_FAIL_SCORE
+        reasons.append("Authentication failure detected (SPF/DKIM)")
+
+    if not found.isdisjoint(LINK_INDICATORS):
+        score += LINK_SCORE
+        reasons.append("Shortened or insecure link detected")
+
+    if score >= HIGH_RISK_SCORE:
+        risk = "High"
+    elif score >= MEDIUM_RISK_SCORE:
+        risk = "Medium"
+    else:
+        risk = "Low"
+
+    if not reasons:
+        reasons.append("No suspicious indicators found")
+
+    return risk, reasons, score
@@ -1,8 +1,9 @@
 from fastapi import FastAPI, UploadFile, File
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from fastapi.middleware.cors import CORSMiddleware
-import re
-from datetime import datetime
+from datetime import datetime, timezone
+
+from analyzer import detect_phishing, domain_reputation, extract_fields
 
 app = FastAPI()
 
@@ -20,79 +21,27 @@ class HeaderRequest(BaseModel):
     header: str
 
 
-# ---------------- HELPER FUNCTION ----------------
-def extract(pattern, text):
-    match = re.search(pattern, text, re.IGNORECASE)
-    return match.group(1).strip() if match else "N/A"
-
-
-# ---------------- DOMAIN REPUTATION ----------------
-TRUSTED_TLDS = [".gov", ".edu"]
-COMMON_MAIL_PROVIDERS = ["gmail.com", "outlook.com", "yahoo.com", "icloud.com"]
-KNOWN_BRANDS = ["sbi", "paypal", "amazon", "google", "microsoft", "apple"]
-
-
-def domain_reputation(sender_line: str):
-    match = re.search(r"<(.+?)>", sender_line)
-    if not match:
-        return "Unknown", "Could not extract sender domain"
-
-    email = match.group(1).lower()
-    domain = email.split("@")[-1]
-
-    if any(domain.endswith(tld) for tld in TRUSTED_TLDS):
-        return "Trusted", "Official organization domain"
-
-    if domain in COMMON_MAIL_PROVIDERS:
-        return "Neutral", "Public email provider"
-
-    name_part = sender_line.lower()
-    for brand in KNOWN_BRANDS:
-        if brand in name_part and brand not in domain:
-            return "Suspicious", f"Brand name '{brand}' does not match domain"
-
-    if re.search(r"\d{3,}|-|secure|login|verify", domain):
-        return "Suspicious", "Domain looks auto-generated or phishing-style"
+class HeaderAnalysis(BaseModel):
+    mode: str
+    subject: str
+    sender: str = Field(alias="from")
+    to: str
+    date: str
+    risk: str
+    score: int
+    reasons: list[str]
+    domain_reputation: str
+    domain_note: str
+    checked_at: datetime
 
-    return "Unknown", "No strong indicators"
 
-
-# ---------------- PHISHING SCORE ----------------
-def detect_phishing(text: str):
-    h = text.lower()
-    score = 0
-    reasons = []
-
-    keywords = [
-        "verify", "urgent", "suspend", "immediately", "click",
-        "login", "password", "bank", "account blocked",
-        "lottery", "winner", "reward", "free", "otp"
-    ]
-
-    for k in keywords:
-        if k in h:
-            score += 12
-            reasons.append(f"Suspicious word detected: {k}")
-
-    if "spf=fail" in h or "dkim=fail" in h:
-        score += 35
-        reasons.append("Authentication failure detected (SPF/DKIM)")
-
-    if "http://" in h or "bit.ly" in h or "tinyurl" in h:
-        score += 20
-        reasons.append("Shortened or insecure link detected")
-
-    if score >= 70:
-        risk = "High"
-    elif score >= 35:
-        risk = "Medium"
-    else:
-        risk = "Low"
-
-    if not reasons:
-        reasons.append("No suspicious indicators found")
-
-    return risk, reasons, score
+class ScreenshotAnalysis(BaseModel):
+    mode: str
+    message_text: str
+    risk: str
+    score: int
+    reasons: list[str]
+    checked_at: datetime
 
 
 # ---------------- ROOT ----------------
@@ -102,14 +51,16 @@ def root():
 
 
 # ---------------- HEADER ANALYSIS ----------------
-@app.post("/analyze")
+@app.post("/analyze", response_model=HeaderAnalysis)
 def analyze_email(request: HeaderRequest):
-    header = request.header
+    # encoded once; the analyzer scans and extracts fields on bytes
+    header = request.header.encode()
 
-    subject = extract(r"Subject:(.*)", header)
-    sender = extract(r"From:(.*)", header)
-    receiver = extract(r"To:(.*)", header)
-    date = extract(r"Date:(.*)", header)
+    fields = extract_fields(header)
+    subject = fields.get("Subject", "N/A")
+    sender = fields.get("From", "N/A")
+    receiver = fields.get("To", "N/A")
+    date = fields.get("Date", "N/A")
 
     risk, reasons, score = detect_phishing(header)
     reputation, rep_reason = domain_reputation(sender)
@@ -125,21 +76,25 @@ def analyze_email(request: HeaderRequest):
         "reasons": reasons,
         "domain_reputation": reputation,
         "domain_note": rep_reason,
-        "checked_at": datetime.utcnow().isoformat()
+        "checked_at": datetime.now(timezone.utc)
     }
 
 
 # ---------------- SCREENSHOT ANALYSIS ----------------
-@app.post("/analyze-image")
-async def analyze_image(file: UploadFile = File(...)):
-    content = await file.read()
+# only this much of an upload is read and scanned
+MAX_UPLOAD = 64 * 1024
+
 
-    try:
-        text = content.decode("utf-8", errors="ignore")
-    except:
-        text = str(content)
+@app.post("/analyze-image", response_model=ScreenshotAnalysis)
+def analyze_image(file: UploadFile = File(...)):
+    # sync so the decode and scan run in the threadpool, not on the event loop
+    content = file.file.read(MAX_UPLOAD)
 
-    risk, reasons, score = detect_phishing(text)
+    # the scan works on the raw bytes; the preview decodes the whole (capped)
+    # read, since errors="ignore" drops binary bytes and a fixed-size prefix
+    # can decode to far fewer than 1000 characters
+    risk, reasons, score = detect_phishing(content)
+    text = content.decode("utf-8", errors="ignore")
 
     return {
         "mode": "screenshot",
@@ -147,5 +102,5 @@ async def analyze_image(file: UploadFile = File(...)):
         "risk": risk,
         "score": score,
         "reasons": reasons,
-        "checked_at": datetime.utcnow().isoformat()
+        "checked_at": datetime.now(timezone.utc)
     }
\ No newline at end of file